@@ -1,13 +1,17 @@
 """Climate parser."""
 import logging
+import os
 from contextlib import contextmanager
 from copy import deepcopy
+from fnmatch import fnmatch
 from itertools import chain
 from pathlib import Path
 from pprint import pformat
+from stat import S_ISDIR
 from typing import (
     Any,
     Callable,
+    Dict,
     Iterable,
     Iterator,
     List,
@@ -23,6 +27,7 @@ from typing import (
 
 import wrapt
 
+from climatecontrol import file_loaders
 from climatecontrol.constants import REMOVED
 from climatecontrol.env_parser import EnvParser
 from climatecontrol.file_loaders import FileLoader, iter_load
@@ -33,21 +38,25 @@ from climatecontrol.processors import (
     replace_from_env_vars,
     replace_from_file_vars,
 )
-from climatecontrol.utils import merge_nested
-
-try:
-    import click
-except ImportError:
-    click = None  # type: ignore
-
+from climatecontrol.utils import (
+    contains_nested,
+    copy_nested,
+    get_nested,
+    merge_nested,
+    merge_nested_inplace,
+)
 
 logger = logging.getLogger(__name__)
 T = TypeVar("T", bound=wrapt.ObjectProxy)
 
+_DICT_ATTRIBUTES = frozenset(dir(dict))
+
 
 class ObjectProxy(wrapt.ObjectProxy):
     """Simple object proxy with added representation of wrapped object."""
 
+    __slots__ = ()
+
     def __repr__(self) -> str:
         return repr(self.__wrapped__)
 
@@ -78,30 +87,36 @@ class SettingsItem(ObjectProxy):
 
     """
 
+    # Many short lived settings items are created when navigating settings so
+    # store the proxy attributes in slots.
+    __slots__ = ("_self_climate", "_self_path")
+
     def __init__(self, wrapped, climate: "Climate", path: FragmentPath) -> None:
         super().__init__(wrapped)
         self._self_climate = climate
         self._self_path = path
 
     def __repr__(self) -> str:
-        self._self_climate.ensure_initialized()
+        self._self_climate._ensure_initialized()
         return super().__repr__()
 
     def __getattr__(self, key):
-        self._self_climate.ensure_initialized()
-        try:
-            result = getattr(self.__wrapped__, key)
-        except AttributeError as e:
+        self._self_climate._ensure_initialized()
+        wrapped = self.__wrapped__
+        if type(wrapped) is dict and key not in _DICT_ATTRIBUTES and key in wrapped:
+            # Fast path for plain dictionaries: the key can't be an attribute so
+            # avoid raising (and catching) an attribute error below.
+            result = wrapped[key]
+        else:
             try:
-                result = self.__wrapped__[key]
-            except (TypeError, KeyError):
-                raise e
+                result = getattr(wrapped, key)
+            except AttributeError as e:
+                try:
+                    result = wrapped[key]
+                except (TypeError, KeyError):
+                    raise e
         if self._self_is_mutable(result):
-            return type(self)(
-                result,
-                self._self_climate,
-                type(self._self_path)(list(self._self_path) + [key]),
-            )
+            return type(self)(result, self._self_climate, self._self_path.append(key))
         return result
 
     def __deepcopy__(self: T, memo: dict) -> T:
@@ -122,14 +137,10 @@ class SettingsItem(ObjectProxy):
         super().__delattr__(key)
 
     def __getitem__(self, key):
-        self._self_climate.ensure_initialized()
+        self._self_climate._ensure_initialized()
         result = self.__wrapped__.__getitem__(key)
         if self._self_is_mutable(result):
-            return type(self)(
-                result,
-                self._self_climate,
-                type(self._self_path)(list(self._self_path) + [key]),
-            )
+            return type(self)(result, self._self_climate, self._self_path.append(key))
         return result
 
     def __setitem__(self, key, value) -> None:
@@ -140,6 +151,10 @@ class SettingsItem(ObjectProxy):
 
     @classmethod
     def _self_is_mutable(cls, value: Any) -> bool:
+        value_type = type(value)
+        if value_type is dict or value_type is list:
+            # fast path for the most common types avoiding the slower abc checks
+            return True
         return isinstance(value, (MutableMapping, MutableSequence))
 
 
@@ -205,6 +220,7 @@ class Climate:
         self._updates = []
         self._fragments = []
         self._initialized = False
+        self._ensure_initialized: Callable[[], None] = self.ensure_initialized
         # We use an object proxy here so that the referene to the object is always the same.
         # Note that instead of assigning _data directly, we reinitialize it using self._set_data(new_obj).
         self._data = ObjectProxy(None)
@@ -277,56 +293,36 @@ class Climate:
         """
         prefix = self.env_parser.prefix.strip(self.env_parser.split_char).lower()
         base_pattern = f"*{prefix}*settings"
-        extensions = [
-            ext
-            for loader in FileLoader.registered_loaders
-            for ext in loader.valid_file_extensions
-        ]
+        extension_set = frozenset(FileLoader.registered_file_extensions())
 
-        def find_settings_files(path: Path, glob_pattern: str, recursive=False):
+        def find_settings_files(
+            path: Path, glob_pattern: str, recursive=False
+        ) -> Iterator[Path]:
+            # List the directory once and filter by extension and pattern
+            # afterwards instead of globbing once per extension.
             glob = path.rglob if recursive else path.glob
-            filepaths = []
-            for ext in extensions:
-                for filepath in glob(f"{glob_pattern}{ext}"):
-                    if filepath.is_file():
-                        filepaths.append(filepath)
-            return sorted(filepaths)
+            for filepath in glob("*"):
+                if (
+                    filepath.suffix in extension_set
+                    and fnmatch(filepath.stem, glob_pattern)
+                    and filepath.is_file()
+                ):
+                    yield filepath
 
         # Find all directories between current directory and project root
-        search_directories: List[Path] = []
-        project_root_candidates = [
-            ".git",
-            ".hg",
-            "setup.py",
-            "requirements.txt",
-            "environment.yml",
-            "environment.yaml",
-            "pyproject.toml",
-        ]
-        current_path: Path = Path(".")
-        while True:
-            search_directories.append(current_path)
-            new_current_path = current_path / ".."
-            if (
-                any(
-                    (current_path / candidate).exists()
-                    for candidate in project_root_candidates
-                )
-                or not new_current_path.is_dir()
-                or new_current_path.resolve() == current_path.resolve()
-            ):
-                break
-            current_path = new_current_path
+        search_directories = _find_project_directories(Path("."))
 
         # Iterate over all directories and find files
         filepaths: List[Path] = []
         for directory in reversed(search_directories):
-            filepaths.extend(find_settings_files(directory, base_pattern))
+            filepaths.extend(sorted(find_settings_files(directory, base_pattern)))
             for sub_dir in directory.glob(base_pattern):
                 if not sub_dir.is_dir():
                     continue
                 # Use all files with valid file extensions if already in settings directory.
-                filepaths.extend(find_settings_files(sub_dir, "*", recursive=True))
+                filepaths.extend(
+                    sorted(find_settings_files(sub_dir, "*", recursive=True))
+                )
 
         return filepaths
 
@@ -336,10 +332,8 @@ class Climate:
 
         def iter_fragment_lines(fragment: Fragment) -> Iterator[str]:
             for leaf in fragment.iter_leaves():
-                action = "removed" if leaf.value == REMOVED else "loaded"
-                yield action + " " + ".".join(
-                    str(p) for p in leaf.path
-                ) + " from " + str(leaf.source)
+                action = "removed" if leaf.value is REMOVED else "loaded"
+                yield f"{action} {'.'.join(map(str, leaf.path))} from {leaf.source}"
 
         lines = chain.from_iterable(
             iter_fragment_lines(fragment) for fragment in self._fragments
@@ -352,6 +346,18 @@ class Climate:
         self._updates.clear()
         self._fragments.clear()
         self._initialized = False  # next access should reload all fragments
+        self._ensure_initialized = self.ensure_initialized
+
+    def clear_file_cache(self) -> None:
+        """Discard all cached file contents.
+
+        Parsed yaml and toml files are cached until their size or modification
+        time changes. Use this to force all files to be read from disk on the
+        next load. Note that the cache is shared by all :class:`Climate`
+        objects.
+
+        """
+        file_loaders.clear_file_cache()
 
     def ensure_initialized(self):
         """Ensure that object is initialized and reload if it is not."""
@@ -413,14 +419,23 @@ class Climate:
         base_fragments: List[Fragment] = [self._combined_fragment]
         new_updates = [update_data]
         update_fragments = list(self._iter_update_fragments(new_updates))
+        fragments = self._fragments + update_fragments
+        updates = self._updates + new_updates
+
+        if len(update_fragments) == 1 and contains_nested(
+            self._combined_fragment.expand_value_with_path(), update_data
+        ):
+            # The update doesn't change any values so the update is only
+            # recorded (for later reloads) and merging and parsing is skipped.
+            self._fragments = fragments
+            self._updates = updates
+            return
+
         combined = self._combine_fragments(chain(base_fragments, update_fragments))
         expanded = combined.expand_value_with_path()
         clean_removed_items(expanded)
         parsed = self.parse(expanded)
 
-        fragments = self._fragments + update_fragments
-        updates = self._updates + new_updates
-
         self._set_state(parsed, combined, fragments, updates)
 
     def parse(self, data: Any) -> Any:
@@ -451,7 +466,15 @@ class Climate:
             logging_settings_update = getattr(self.settings, logging_section)
         except (KeyError, TypeError, AttributeError):
             logging_settings_update = None
-        if logging_settings_update:
+        if isinstance(logging_settings_update, Mapping) and logging_settings_update:
+            # Only merge the sections that are updated and reuse the default
+            # sections otherwise.
+            logging_settings = dict(DEFAULT_LOG_SETTINGS)
+            for key, value in logging_settings_update.items():
+                logging_settings[key] = merge_nested(
+                    DEFAULT_LOG_SETTINGS.get(key), value
+                )
+        elif logging_settings_update:
             logging_settings = merge_nested(logging_settings, logging_settings_update)
         logging_config.dictConfig(logging_settings)
 
@@ -478,15 +501,23 @@ class Climate:
             >>> assert climate.settings['a'] == 1
 
         """
-        archived_data = deepcopy(self._data.__wrapped__)
-        archived_settings = {
-            k: deepcopy(getattr(self, k))
-            for k in [
-                "settings_files",
-                "_updates",
-                "_fragments",
-                "_combined_fragment",
-            ]
+        # The parsed data can share containers with the combined fragment, the
+        # fragments and the updates (e.g. if there is only one update), so
+        # all of them are copied together to preserve that sharing and to
+        # roll back changes made to the settings in place.
+        archived_data, archived_state = deepcopy(
+            (
+                self._data.__wrapped__,
+                {
+                    "_updates": self._updates,
+                    "_fragments": self._fragments,
+                    "_combined_fragment": self._combined_fragment,
+                },
+            )
+        )
+        archived_settings: Dict[str, Any] = {
+            "settings_files": list(self.settings_files),
+            **archived_state,
         }
         yield self
 
@@ -504,6 +535,9 @@ class Climate:
         self._set_data(parsed)
         self._updates = updates
         self._initialized = True
+        # Settings items check for initialization on every access so once we
+        # are initialized, replace the check with a function that does nothing.
+        self._ensure_initialized = _noop
 
     def _set_data(self, value: Any) -> None:
         self._data.__init__(value)
@@ -532,19 +566,28 @@ class Climate:
         return parsed, combined, fragments
 
     def _process_fragment(self, fragment: Fragment) -> Iterator[Fragment]:
-        """Preprocess a settings fragment and return the new version."""
+        """Run all processors on a settings fragment and yield the new fragments."""
         for process in self._processors:
-            for new_fragment in process(fragment):
-                yield new_fragment
-                # recursively process new fragments as well
-                yield from self._process_fragment(new_fragment)
+            yield from process(fragment)
 
     def _iter_process_fragments(
         self, fragments: Iterable[Fragment]
     ) -> Iterator[Fragment]:
-        for fragment in fragments:
+        """Yield each fragment followed by the fragments produced by processing it.
+
+        New fragments are processed as well (depth first). A stack of
+        iterators is used instead of recursion so that deeply nested
+        replacements don't build up a chain of generators.
+
+        """
+        stack: List[Iterator[Fragment]] = [iter(fragments)]
+        while stack:
+            fragment = next(stack[-1], None)
+            if fragment is None:
+                stack.pop()
+                continue
             yield fragment
-            yield from self._process_fragment(fragment)
+            stack.append(self._process_fragment(fragment))
 
     def _iter_update_fragments(self, updates: Sequence[Mapping] = ()):
         fragments = (
@@ -560,17 +603,40 @@ class Climate:
         yield from self._iter_process_fragments(fragments)
 
     def _combine_fragments(self, fragments: Iterable[Fragment]) -> Fragment:
-        """Combine the fragments into one final fragment."""
-        combined_fragment: Optional[Fragment] = None
-        for fragment in fragments:
-            if combined_fragment is None:
-                combined_fragment = fragment
-            else:
-                combined_fragment = combined_fragment.merge(fragment)
-
-        if not combined_fragment:
-            combined_fragment = Fragment({})
-        return combined_fragment
+        """Combine the fragments into one final fragment.
+
+        The result is the same as merging the fragments one after the other
+        with :meth:`Fragment.merge`. Instead of copying the combined value on
+        every merge, the fragments are merged into a single copy of the first
+        fragment's expanded value.
+
+        """
+        fragment_list = list(fragments)
+        if not fragment_list:
+            return Fragment({})
+        first_fragment = fragment_list[0]
+        if len(fragment_list) <= 2:
+            # a single merge doesn't profit from merging in place
+            for fragment in fragment_list[1:]:
+                first_fragment = first_fragment.merge(fragment)
+            return first_fragment
+        # merge_nested_inplace only modifies dicts and lists so only those
+        # need to be copied to leave the first fragment untouched.
+        merged_value = copy_nested(first_fragment.expand_value_with_path())
+        path = first_fragment.path
+        sources = [first_fragment.source] if first_fragment.source else []
+        for fragment in fragment_list[1:]:
+            merged_value = merge_nested_inplace(
+                merged_value, fragment.expand_value_with_path()
+            )
+            path = path.common(fragment.path)
+            if fragment.source:
+                sources.append(fragment.source)
+        return first_fragment.clone(
+            value=get_nested(merged_value, path),
+            source=", ".join(str(s) for s in sources),
+            path=path,
+        )
 
     def _iter_load_files(self) -> Iterator[Fragment]:
         for inferred_entry in self.inferred_settings_files:
@@ -580,22 +646,73 @@ class Climate:
             yield from iter_load(entry)
 
 
+_PROJECT_ROOT_CANDIDATES = frozenset(
+    [
+        ".git",
+        ".hg",
+        "setup.py",
+        "requirements.txt",
+        "environment.yml",
+        "environment.yaml",
+        "pyproject.toml",
+    ]
+)
+
+
+def _find_project_directories(current_path: Path) -> List[Path]:
+    """Return all directories from ``current_path`` up to the project root."""
+    search_directories: List[Path] = []
+    current_stat = current_path.stat()
+    while True:
+        search_directories.append(current_path)
+        if _is_project_root(current_path):
+            break
+        new_current_path = current_path / ".."
+        try:
+            new_stat = new_current_path.stat()
+        except OSError:
+            break
+        # Compare file stats instead of resolved paths to detect the filesystem root.
+        if not S_ISDIR(new_stat.st_mode) or os.path.samestat(new_stat, current_stat):
+            break
+        current_path = new_current_path
+        current_stat = new_stat
+    return search_directories
+
+
+def _is_project_root(path: Path) -> bool:
+    """Check if ``path`` contains any of the project root markers."""
+    try:
+        # List the directory once instead of checking every candidate separately.
+        with os.scandir(path) as entries:
+            return any(entry.name in _PROJECT_ROOT_CANDIDATES for entry in entries)
+    except OSError:
+        # Directories that can be entered but not listed can still be checked
+        # for each candidate.
+        return any(
+            (path / candidate).exists() for candidate in _PROJECT_ROOT_CANDIDATES
+        )
+
+
+def _noop() -> None:
+    """Do nothing."""
+
+
 def clean_removed_items(obj):
     """Remove all keys that contain a removed key indicated by a :data:``REMOVED`` object."""
-    items: Iterable[Tuple[Any, Any]]
-    if isinstance(obj, MutableMapping):
-        items = obj.items()
-    elif isinstance(obj, MutableSequence):
-        items = enumerate(obj)
-    else:
-        return
-
-    keys_to_remove = []
-    for key, value in items:
-        if value == REMOVED:
-            keys_to_remove.append(key)
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        values: Iterable[Any]
+        if isinstance(current, MutableMapping):
+            for key in [k for k, v in current.items() if v is REMOVED]:
+                del current[key]
+            values = current.values()
+        elif isinstance(current, MutableSequence):
+            current[:] = [v for v in current if v is not REMOVED]
+            values = current
         else:
-            clean_removed_items(value)
-
-    for key in keys_to_remove:
-        del obj[key]
+            continue
+        stack.extend(
+            v for v in values if isinstance(v, (MutableMapping, MutableSequence))
+        )
@@ -2,7 +2,16 @@
 
 import logging
 import os
-from typing import Iterable, Iterator, NamedTuple, Tuple
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from . import file_loaders
 from .fragment import Fragment
@@ -60,36 +69,48 @@ class EnvParser:
         exclude: Iterable[str] = (),
     ) -> None:
         """Initialize object."""
-        self.settings_file_suffix = str(settings_file_suffix)
-        self.split_char = split_char
-        self.prefix = prefix
-        self.exclude = exclude  # type: ignore
+        self._settings_file_suffix = str(settings_file_suffix)
+        self._prefix = str(prefix)
+        self._exclude = frozenset({s.lower() for s in exclude})
+        self.split_char = split_char  # also computes the derived variable names
 
     @property
     def exclude(self) -> Tuple[str, ...]:
         """Return excluded environment variables."""
-        exclude = self._exclude.union({self.settings_file_env_var})
-        return tuple(set(s.lower() for s in exclude))
+        return self._exclude_tuple
 
     @exclude.setter
     def exclude(self, exclude: Iterable[str] = ()) -> None:
         """Set excluded environment variables."""
-        self._exclude = set(exclude)
+        self._exclude = frozenset({s.lower() for s in exclude})
+        self._update_env_var_names()
 
     @property
     def prefix(self) -> str:
         """Return prefix used to filter used environment variables."""
-        return self._build_env_var(self._prefix) + self.split_char
+        return self._prefix_env_var
 
     @prefix.setter
     def prefix(self, value: str):
         """Set prefix used to filter used environment variables."""
         self._prefix = str(value)
+        self._update_env_var_names()
+
+    @property
+    def settings_file_suffix(self) -> str:
+        """Return suffix used to identify the settings file environment variable."""
+        return self._settings_file_suffix
+
+    @settings_file_suffix.setter
+    def settings_file_suffix(self, value: str):
+        """Set suffix used to identify the settings file environment variable."""
+        self._settings_file_suffix = str(value)
+        self._update_env_var_names()
 
     @property
     def settings_file_env_var(self) -> str:
         """Return environment variable used to indicate a path to a settings file."""
-        return self._build_env_var(self.prefix, self.settings_file_suffix)
+        return self._settings_file_env_var
 
     @settings_file_env_var.setter
     def settings_file_env_var(self, value: str):
@@ -109,7 +130,8 @@ class EnvParser:
         char = str(char)
         if len(char) != 1:
             raise ValueError("``split_char`` must be a single character")
-        self._split_char = str(char)
+        self._split_char = char
+        self._update_env_var_names()
 
     def iter_load(self) -> Iterator[Fragment]:
         """Convert environment variables to fragments.
@@ -121,46 +143,92 @@ class EnvParser:
             Fragment representing a single environment variable value.
 
         """
-        settings_file_str = os.getenv(self.settings_file_env_var, "")
+        # Copy the environment once so that all values are read from the same
+        # state without going through the os.environ mapping again.
+        environ = dict(os.environ)
+        settings_file_str = environ.get(self._settings_file_env_var, "")
         settings_files = [s.strip() for s in settings_file_str.split(",")]
+        settings_files = [s for s in settings_files if s]
+        source_prefix = "ENV:" + self._settings_file_env_var + ":"
         for settings_file in settings_files:
             for fragment in file_loaders.iter_load(settings_file):
-                fragment.source = (
-                    "ENV:" + str(self.settings_file_env_var) + ":" + fragment.source
-                )
+                fragment.source = source_prefix + fragment.source
                 yield fragment
-        for env_var, env_var_value in os.environ.items():
-            nested_keys = list(self._iter_nested_keys(env_var))
-            if not nested_keys:
+        # local names avoid global lookups for every variable
+        parse_nested_keys = self._build_key_parser()
+        parse_value = parse_as_json_if_possible
+        for env_var, env_var_value in environ.items():
+            nested_keys = parse_nested_keys(env_var)
+            if nested_keys is None:
                 continue
-            value = parse_as_json_if_possible(env_var_value)
+            value = parse_value(env_var_value)
             fragment = Fragment(value=value, path=nested_keys, source="ENV:" + env_var)
             yield fragment
 
+    def _update_env_var_names(self) -> None:
+        """Precompute the names derived from the parser settings.
+
+        These are needed for every environment variable that is parsed so they
+        are only computed when one of the settings changes.
+
+        """
+        self._prefix_env_var = self._build_env_var(self._prefix) + self._split_char
+        self._prefix_lower = self._prefix_env_var.lower()
+        self._prefix_upper = self._prefix_env_var.upper()
+        self._prefix_first_chars = frozenset(
+            [self._prefix_lower[:1], self._prefix_upper[:1]]
+        )
+        self._prefix_len = len(self._prefix_env_var)
+        self._section_separator = self._split_char * 2
+        self._settings_file_env_var = self._build_env_var(
+            self._prefix_env_var, self._settings_file_suffix
+        )
+        self._exclude_lower = self._exclude | {self._settings_file_env_var.lower()}
+        self._exclude_tuple = tuple(self._exclude_lower)
+
     def _build_env_var(self, *parts: str) -> str:
-        return self.split_char.join(self._strip_split_char(p).upper() for p in parts)
+        return self._split_char.join(self._strip_split_char(p).upper() for p in parts)
 
-    def _iter_nested_keys(self, env_var: str) -> Iterator[str]:
-        """Iterate over nested keys of an environment variable name.
+    def _build_key_parser(self) -> Callable[[str], Optional[List[Union[str, int]]]]:
+        """Build a function that parses the nested keys of a variable name.
 
-        Yields:
-            String representing each nested key.
+        The returned function returns a list of nested keys or ``None`` if
+        the variable is not used by this parser. The parser settings are
+        bound to local names so that scanning many variables doesn't look up
+        attributes for every one of them.
 
         """
-        env_var_low = env_var.lower()
-        if env_var_low in self.exclude or not env_var_low.startswith(
-            self.prefix.lower()
-        ):
-            return
-        body = env_var_low[len(self.prefix) :]
-        sections = body.split(self.split_char * 2)
-        for i_section, section in enumerate(sections):
-            if section:
-                yield int_if_digit(section)
+        prefix_upper = self._prefix_upper
+        prefix_lower = self._prefix_lower
+        prefix_first_chars = self._prefix_first_chars
+        prefix_len = self._prefix_len
+        exclude = self._exclude_lower
+        separator = self._section_separator
+        to_key = int_if_digit
+
+        def parse_nested_keys(env_var: str) -> Optional[List[Union[str, int]]]:
+            # Most variables don't match the prefix and are upper case, so
+            # reject them as cheaply as possible before lower casing them.
+            if not env_var.startswith(prefix_upper):
+                if (
+                    env_var[:1] not in prefix_first_chars
+                    or env_var[:prefix_len].lower() != prefix_lower
+                ):
+                    return None
+            env_var_low = env_var.lower()
+            if env_var_low in exclude:
+                return None
+            body = env_var_low[prefix_len:]
+            nested_keys = [
+                to_key(section) for section in body.split(separator) if section
+            ]
+            return nested_keys or None
+
+        return parse_nested_keys
 
     def _strip_split_char(self, s):
-        if s.startswith(self.split_char):
-            s = s[len(self.split_char) :]
-        elif s.endswith(self.split_char):
-            s = s[: -len(self.split_char)]
+        if s.startswith(self._split_char):
+            s = s[len(self._split_char) :]
+        elif s.endswith(self._split_char):
+            s = s[: -len(self._split_char)]
         return s
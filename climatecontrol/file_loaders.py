@@ -2,22 +2,159 @@
 
 import glob
 import json
+import mmap
 import os
+import threading
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from copy import deepcopy
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Tuple, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 from .exceptions import NoCompatibleLoaderFoundError
 from .fragment import Fragment
 
 try:
-    import tomli
+    import orjson
 except ImportError:  # pragma: nocover
-    tomli = None  # type: ignore
-try:
-    import yaml
-except ImportError:  # pragma: nocover
-    yaml = None  # type: ignore
+    orjson = None  # type: ignore
+_NOT_LOADED = object()
+
+# The yaml and toml parsers are only imported once the first file of their
+# format is loaded (see `_import_yaml` and `_import_toml`) since importing them
+# noticeably slows down importing this package. They are set to ``None`` if
+# the parser is not installed.
+yaml: Any = _NOT_LOADED
+tomli: Any = _NOT_LOADED
+_YamlSafeLoader: Any = None
+
+# Minimum size of json files that are memory mapped instead of read.
+_MMAP_MIN_SIZE = 64 * 1024
+# Number of parsed files kept by _load_file_cached.
+_FILE_CACHE_SIZE = 64
+_file_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+_file_cache_lock = threading.Lock()
+
+
+def _import_yaml() -> None:
+    global yaml, _YamlSafeLoader
+    try:
+        import yaml as yaml_module
+    except ImportError:  # pragma: nocover
+        yaml = None
+        return
+    # Prefer the much faster libyaml based loader if pyyaml was built with it.
+    _YamlSafeLoader = getattr(yaml_module, "CSafeLoader", yaml_module.SafeLoader)
+    yaml = yaml_module
+
+
+def _import_toml() -> None:
+    global tomli
+    try:
+        # the standard library toml parser (python 3.11+) has the same api as tomli
+        import tomllib as toml_module
+    except ImportError:  # pragma: nocover
+        try:
+            import tomli as toml_module  # type: ignore
+        except ImportError:
+            tomli = None
+            return
+    tomli = toml_module
+
+
+def _json_loads(content: Union[str, bytes]) -> Any:
+    """Load json using ``orjson`` if it is installed and :mod:`json` otherwise."""
+    if orjson is not None:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than the standard library (it rejects ``NaN``
+            # or integers that don't fit in 64 bits) so let json decide.
+            pass
+    return json.loads(content)
+
+
+def _load_json_file(path: str) -> Any:
+    """Load a json file.
+
+    Large files are memory mapped and handed to ``orjson`` without copying
+    them into a bytes object first. Empty files can't be memory mapped and are
+    always read.
+
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if orjson is None or not size or size < _MMAP_MIN_SIZE:
+            return _json_loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                try:
+                    return orjson.loads(view)
+                except orjson.JSONDecodeError:
+                    pass
+            # see _json_loads: let json decide what orjson rejected
+            return json.loads(mapped[:])
+
+
+def _load_file_cached(loader: Any, path: str, load: Callable[[str], Any]) -> Any:
+    """Load a file with ``load`` but reuse the result if the file didn't change.
+
+    Files are identified by their device and inode and considered unchanged
+    if their size and modification time are the same. This misses files that
+    are rewritten with the same size within the timestamp resolution of the
+    file system, use :func:`clear_file_cache` to read them again. A copy of
+    the cached data is returned so that callers can't modify the cache.
+
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return load(path)
+    key = (loader, stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    with _file_cache_lock:
+        data = _file_cache.get(key, _NOT_LOADED)
+        if data is not _NOT_LOADED:
+            _file_cache.move_to_end(key)
+    if data is _NOT_LOADED:
+        data = load(path)
+        with _file_cache_lock:
+            _file_cache[key] = data
+            if len(_file_cache) > _FILE_CACHE_SIZE:
+                _file_cache.popitem(last=False)
+    return _copy_loaded(data)
+
+
+def clear_file_cache() -> None:
+    """Discard all cached file contents.
+
+    Files are reloaded from disk the next time they are read, even if their
+    size and modification time did not change.
+
+    """
+    with _file_cache_lock:
+        _file_cache.clear()
+
+
+def _copy_loaded(value: Any) -> Any:
+    """Copy data loaded from a file (faster than deepcopy for plain data)."""
+    value_type = type(value)
+    if value_type is dict:
+        return {k: _copy_loaded(v) for k, v in value.items()}
+    elif value_type is list:
+        return [_copy_loaded(v) for v in value]
+    elif value_type in (str, int, float, bool, type(None)):
+        return value
+    return deepcopy(value)
+
+
+def _has_glob_magic(path: str) -> bool:
+    """Check if a path is a glob expression (same as :func:`glob.has_magic`).
+
+    Checking for the characters directly is several times faster than the
+    regular expression search used by :func:`glob.has_magic`.
+
+    """
+    return "*" in path or "?" in path or "[" in path
 
 
 def iter_load(path: Union[str, Path]) -> Iterator[Fragment]:
@@ -39,8 +176,13 @@ def iter_load(path: Union[str, Path]) -> Iterator[Fragment]:
     """
     if not path:
         return
-    expanded_path: str = os.path.expanduser(os.path.expandvars(path))
-    if glob.has_magic(expanded_path):
+    expanded_path: str = os.fspath(path)
+    # most paths contain no variables or home directory so skip expanding them
+    if "$" in expanded_path or "%" in expanded_path:
+        expanded_path = os.path.expandvars(expanded_path)
+    if expanded_path.startswith("~"):
+        expanded_path = os.path.expanduser(expanded_path)
+    if _has_glob_magic(expanded_path):
         filepaths: List[str] = sorted(glob.glob(expanded_path))
     else:
         filepaths = [expanded_path]
@@ -64,6 +206,13 @@ def load_from_filepath(filepath: str) -> Dict[str, Any]:
     file_data: dict = {}
     if not filepath:
         return file_data
+    # Look up the loader by file extension first and only fall back to asking
+    # each loader if that fails.
+    extension = os.path.splitext(filepath)[1]
+    extension_loader = FileLoader.loaders_by_extension().get(extension)
+    if extension_loader is not None and extension_loader.is_path(filepath):
+        file_data = extension_loader.from_path(filepath)
+        return file_data
     for loader in FileLoader.registered_loaders:
         if loader.is_path(filepath):
             file_data = loader.from_path(filepath)
@@ -82,6 +231,8 @@ class FileLoader(ABC):
     format_name: str = ""
     valid_file_extensions: Tuple[str, ...] = ()
     registered_loaders: List["FileLoader"] = []
+    _registered_file_extensions: Optional[Tuple[str, ...]] = None
+    _loaders_by_extension: Optional[Dict[str, "FileLoader"]] = None
 
     @classmethod
     @abstractmethod
@@ -100,16 +251,55 @@ class FileLoader(ABC):
         If `only_existing` is set to ``True``, paths to files that don't exist
         will also return ``False``.
         """
-        return len(str(path_or_content).strip().splitlines()) == 1 and (
+        # check the extension first since it rejects most inputs without
+        # splitting multi line content into lines
+        return (
             os.path.splitext(path_or_content)[1] in cls.valid_file_extensions
+            and len(str(path_or_content).strip().splitlines()) == 1
         )
 
     @classmethod
     def register(cls, class_to_register):
         """Register class as a valid file loader."""
         cls.registered_loaders.append(class_to_register)
+        FileLoader._registered_file_extensions = None
+        FileLoader._loaders_by_extension = None
         return class_to_register
 
+    @staticmethod
+    def registered_file_extensions() -> Tuple[str, ...]:
+        """Return the file extensions of all registered loaders.
+
+        Example:
+            >>> FileLoader.registered_file_extensions()
+            ('.json', '.yml', '.yaml', '.toml', '.ini', '.config', '.conf', '.cfg')
+
+        """
+        if FileLoader._registered_file_extensions is None:
+            FileLoader._registered_file_extensions = tuple(
+                ext
+                for loader in FileLoader.registered_loaders
+                for ext in loader.valid_file_extensions
+            )
+        return FileLoader._registered_file_extensions
+
+    @staticmethod
+    def loaders_by_extension() -> Dict[str, "FileLoader"]:
+        """Return a mapping of file extensions to the first loader registered for them.
+
+        Example:
+            >>> FileLoader.loaders_by_extension()['.yml']
+            <class 'climatecontrol.file_loaders.YamlLoader'>
+
+        """
+        if FileLoader._loaders_by_extension is None:
+            loaders_by_extension: Dict[str, FileLoader] = {}
+            for loader in FileLoader.registered_loaders:
+                for ext in loader.valid_file_extensions:
+                    loaders_by_extension.setdefault(ext, loader)
+            FileLoader._loaders_by_extension = loaders_by_extension
+        return FileLoader._loaders_by_extension
+
 
 @FileLoader.register
 class JsonLoader(FileLoader):
@@ -121,13 +311,12 @@ class JsonLoader(FileLoader):
     @classmethod
     def from_content(cls, content: str) -> Any:
         """Load json from string."""
-        return json.loads(content)
+        return _json_loads(content)
 
     @classmethod
     def from_path(cls, path: str):
         """Load json from file at path."""
-        with open(path) as f:
-            return json.load(f)
+        return _load_json_file(path)
 
     @classmethod
     def to_content(cls, data) -> str:
@@ -146,17 +335,22 @@ class YamlLoader(FileLoader):
     def from_content(cls, content: str) -> Any:
         """Load data from yaml formatted string."""
         cls._check_yaml()
-        return yaml.safe_load(content)
+        return yaml.load(content, Loader=_YamlSafeLoader)
 
     @classmethod
     def from_path(cls, path: str) -> Any:
         """Load data from path containing a yaml file."""
         cls._check_yaml()
-        with open(path) as f:
-            return yaml.safe_load(f)
+        return _load_file_cached(
+            cls,
+            path,
+            lambda p: yaml.load(Path(p).read_bytes(), Loader=_YamlSafeLoader),
+        )
 
     @staticmethod
     def _check_yaml():
+        if yaml is _NOT_LOADED:
+            _import_yaml()
         if yaml is None:
             raise ImportError(
                 '"pyyaml" package needs to be installed to parse yaml files.'
@@ -180,11 +374,14 @@ class TomlLoader(FileLoader):
     def from_path(cls, path: str):
         """Load toml from file at path."""
         cls._check_toml()
-        with open(path, "rb") as f:
-            return tomli.load(f)
+        return _load_file_cached(
+            cls, path, lambda p: tomli.loads(Path(p).read_bytes().decode("utf-8"))
+        )
 
     @staticmethod
     def _check_toml():
+        if tomli is _NOT_LOADED:
+            _import_toml()
         if tomli is None:
             raise ImportError(
                 '"toml" package needs to be installed to parse toml files.'
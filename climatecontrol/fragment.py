@@ -1,20 +1,22 @@
 """Module for defining settings fragments."""
 
-from contextlib import suppress
-from itertools import zip_longest
+from functools import lru_cache
 from typing import (
     Any,
     Generic,
     Iterable,
     Iterator,
+    List,
     Mapping,
+    Optional,
     Sequence,
+    Tuple,
     Type,
     TypeVar,
     Union,
 )
 
-from .utils import EMPTY, get_nested, merge_nested
+from .utils import _ATOMIC_TYPES, EMPTY, merge_nested
 
 T = TypeVar("T")
 FV = TypeVar("FV")
@@ -22,12 +24,29 @@ FP = TypeVar("FP", bound="FragmentPath")
 F = TypeVar("F", bound="Fragment")
 
 
+@lru_cache(maxsize=4096)
+def _parse_spec_string(spec: str) -> tuple:
+    """Parse a dot separated path spec (the same spec strings tend to repeat)."""
+    return tuple(FragmentPath._iter_spec(spec))
+
+
 class FragmentPath(Sequence):
-    """Path indicating nested levels of a fragment value."""
+    """Path indicating nested levels of a fragment value.
+
+    Paths are immutable and hashable.
+
+    """
+
+    __slots__ = ("_data", "_hash")
 
     def __init__(self, iterable: Iterable = ()) -> None:
         """Assign initial iterable data."""
-        self._data: list = list(iterable)
+        if isinstance(iterable, FragmentPath):
+            # paths are immutable so the data can be shared
+            self._data: tuple = iterable._data
+        else:
+            self._data = tuple(iterable)
+        self._hash: Optional[int] = None
 
     @classmethod
     def from_spec(cls: Type[FP], spec: Union[str, int, Sequence]) -> FP:
@@ -42,13 +61,15 @@ class FragmentPath(Sequence):
             FragmentPath(['a', 'b'])
 
         """
+        if isinstance(spec, str):
+            return cls(_parse_spec_string(spec))
         return cls(cls._iter_spec(spec))
 
     @staticmethod
     def _iter_spec(spec: Any) -> Iterator:
-        try:
-            spec_iter = spec.split(".")
-        except AttributeError:
+        if isinstance(spec, str):
+            spec_iter: Iterable = spec.split(".")
+        else:
             try:
                 spec_iter = iter(spec)
             except TypeError:
@@ -56,28 +77,50 @@ class FragmentPath(Sequence):
                 return
 
         for item in spec_iter:
-            with suppress(AttributeError):
-                if item.isdigit():
-                    item = int(item)
+            if isinstance(item, str) and item.isdigit():
+                item = int(item)
             yield item
 
     def __len__(self) -> int:
         return len(self._data)
 
     def __iter__(self) -> Iterator:
-        yield from self._data
+        return iter(self._data)
 
     def __getitem__(self, index) -> Any:
         return self._data[index]
 
     def __repr__(self) -> str:
-        return "{}({})".format(type(self).__qualname__, repr(self._data))
+        return "{}({})".format(type(self).__qualname__, repr(list(self._data)))
 
     def __str__(self) -> str:
-        return f"{type(self).__qualname__}({self._data})"
+        return f"{type(self).__qualname__}({list(self._data)})"
 
     def __eq__(self, other) -> bool:
-        return type(self) == type(other) and self._data == other._data
+        if self is other:
+            return True
+        return type(self) is type(other) and self._data == other._data
+
+    def __hash__(self) -> int:
+        # tuples don't cache their hash so it is stored on the path instead
+        if self._hash is None:
+            self._hash = hash(self._data)
+        return self._hash
+
+    def append(self: FP, key: Any) -> FP:
+        """Return a new path extended by ``key``.
+
+        The path itself is not changed.
+
+        Example:
+            >>> FragmentPath(['a', 'b']).append(0)
+            FragmentPath(['a', 'b', 0])
+
+        """
+        new_path = type(self).__new__(type(self))
+        new_path._data = self._data + (key,)
+        new_path._hash = None
+        return new_path
 
     def expand(self, value: Any = None) -> Any:
         """Expand path to object.
@@ -90,52 +133,44 @@ class FragmentPath(Sequence):
             {'a': [<EMPTY>, {'b': None}]}
 
         """
-        if not self._data:
-            return value
-        if self._data and self._is_list_index(self._data[0]):
-            new_value: Union[dict, list] = [EMPTY] * (self._data[0] + 1)
-        else:
-            new_value = {}
-        sub_value = new_value
-        for subpath, next_subpath in zip_longest(self._data[:-1], self._data[1:]):
-            if self._is_list_index(next_subpath):
-                sub_value[subpath] = [EMPTY] * (next_subpath + 1)
+        # build the containers from the innermost one outwards
+        for key in reversed(self._data):
+            if isinstance(key, int):
+                container: Union[dict, list] = [EMPTY] * (key + 1)
             else:
-                sub_value[subpath] = {}
-            sub_value = sub_value[subpath]
-
-        # last path value holds the actual value
-        sub_value[self._data[-1]] = value
-
-        return new_value
+                container = {}
+            container[key] = value
+            value = container
+        return value
 
     def common(self: FP, other: Sequence) -> FP:
         """Given a second path, return the part of the sequence up to the point where they first differ."""
-        common_path = []
-        other_path: FragmentPath = type(self)(other)
-        for subpath, subpath_other in zip(self._data, other_path):
-            if subpath == subpath_other:
-                common_path.append(subpath)
-            else:
+        if self is other:
+            return self
+        other_data = other._data if isinstance(other, FragmentPath) else tuple(other)
+        n_common = 0
+        for subpath, subpath_other in zip(self._data, other_data):
+            if subpath != subpath_other:
                 break
-        return type(self)(common_path)
-
-    @classmethod
-    def _is_list_index(cls, index) -> bool:
-        """Check if index is a list index."""
-        return isinstance(index, int)
+            n_common += 1
+        if n_common == len(self._data):
+            return self
+        return type(self)(self._data[:n_common])
 
 
 class Fragment(Generic[FV]):
     """Data fragment for storing a value and metadata related to it."""
 
+    __slots__ = ("value", "source", "path")
+
     path: FragmentPath
 
     def __init__(self, value: FV, source: str = "", path: Sequence = ()) -> None:
         """Initialize fragment."""
         self.value = value
         self.source = source
-        self.path = FragmentPath(path)
+        # paths are immutable so an existing path can be reused as is
+        self.path = path if type(path) is FragmentPath else FragmentPath(path)
 
     def __repr__(self) -> str:
         return "{}(value={}, source={}, path={})".format(
@@ -146,11 +181,14 @@ class Fragment(Generic[FV]):
         )
 
     def __eq__(self, other) -> bool:
-        return (
-            type(self) == type(other)
-            and self.value == other.value
-            and self.source == other.source
-            and self.path == other.path
+        if type(self) is not type(other):
+            return False
+        # the value is compared last since it can be an arbitrarily large
+        # nested structure while source and path are cheap to compare
+        return (self.source, self.path, self.value) == (
+            other.source,
+            other.path,
+            other.value,
         )
 
     def iter_leaves(self: F) -> Iterator[F]:
@@ -160,17 +198,34 @@ class Fragment(Generic[FV]):
         non-dictionary value is found.
 
         """
-        if isinstance(self.value, Mapping):
-            items: Iterable[tuple] = self.value.items()
-        elif isinstance(self.value, Sequence) and not isinstance(self.value, str):
-            items = enumerate(self.value)
-        else:
+        if not self._is_branch(self.value):
             # Can't obtain any items so just assume this is a leaf
             yield self
             return
 
-        for k, v in items:
-            yield from self.clone(value=v, path=list(self.path) + [k]).iter_leaves()
+        # Walk the tree depth first with a stack of (value, path) pairs so
+        # that only the leaves themselves are turned into fragments.
+        stack: List[Tuple[Any, tuple]] = [(self.value, tuple(self.path))]
+        while stack:
+            value, path = stack.pop()
+            if not self._is_branch(value):
+                yield self.clone(value=value, path=path)
+                continue
+            items: Iterable[tuple]
+            if isinstance(value, Mapping):
+                items = value.items()
+            else:
+                items = enumerate(value)
+            # push children in reverse so that they are yielded in order
+            stack.extend(reversed([(v, path + (k,)) for k, v in items]))
+
+    @staticmethod
+    def _is_branch(value: Any) -> bool:
+        if type(value) in _ATOMIC_TYPES:
+            return False
+        return isinstance(value, Mapping) or (
+            isinstance(value, Sequence) and not isinstance(value, str)
+        )
 
     def expand_value_with_path(self) -> Any:
         """Create expanded dictionary where the fragments path acts as nested keys."""
@@ -178,12 +233,13 @@ class Fragment(Generic[FV]):
 
     def merge(self: F, other: "Fragment") -> F:
         """Merge with another fragment."""
-        expanded_value = self.expand_value_with_path()
-        other_expanded_value = other.expand_value_with_path()
-        merged_value = merge_nested(expanded_value, other_expanded_value)
-
+        # Below the common path both fragments are expanded as usual, above
+        # it they are identical so only the remaining parts are expanded.
         new_path = self.path.common(other.path)
-        new_value = get_nested(merged_value, new_path)
+        n_common = len(new_path)
+        self_value = FragmentPath(self.path[n_common:]).expand(self.value)
+        other_value = FragmentPath(other.path[n_common:]).expand(other.value)
+        new_value = merge_nested(self_value, other_value)
         new_source = ", ".join(str(s) for s in [self.source, other.source] if s)
 
         return self.clone(value=new_value, source=new_source, path=new_path)
@@ -1,37 +1,76 @@
 """Fragment processors."""
-import glob
 import logging
 import os
-from typing import Any, Callable, Iterable, Iterator, Mapping, Sequence, Tuple, Type
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
 from climatecontrol.constants import REMOVED
 from climatecontrol.file_loaders import (
     FileLoader,
     NoCompatibleLoaderFoundError,
+    _has_glob_magic,
     iter_load,
     load_from_filepath,
 )
 from climatecontrol.fragment import Fragment, FragmentPath
-from climatecontrol.utils import parse_as_json_if_possible
+from climatecontrol.utils import _ATOMIC_TYPES, parse_as_json_if_possible
 
 logger = logging.getLogger(__name__)
 
 
-def find_suffix(fragment: Fragment, suffix: str) -> Iterator[Fragment]:
-    value = fragment.value
-    if isinstance(value, Mapping):
-        items: Iterable[tuple] = value.items()
-    elif isinstance(value, Sequence) and not isinstance(value, str):
-        items = enumerate(value)
-    else:
-        return
+def find_suffix(
+    fragment: Fragment, suffix: Union[str, Tuple[str, ...]]
+) -> Iterator[Fragment]:
+    """Find all nested values whose key ends with ``suffix``.
+
+    Values below a matching key are not searched any further.
 
-    for k, v in items:
-        new = fragment.clone(value=v, path=list(fragment.path) + [k])
+    Yields:
+        Fragment for each matching key and its value.
+
+    """
+    root_items = _iter_items(fragment.value)
+    if root_items is None:
+        return
+    # Walk depth first with a stack of item iterators so that only matches
+    # are turned into fragments.
+    stack: List[Tuple[Iterator[tuple], tuple]] = [(root_items, tuple(fragment.path))]
+    while stack:
+        items, path = stack[-1]
+        item = next(items, None)
+        if item is None:
+            stack.pop()
+            continue
+        k, v = item
+        item_path = path + (k,)
         if isinstance(k, str) and k.endswith(suffix):
-            yield new
+            yield fragment.clone(value=v, path=item_path)
         else:
-            yield from find_suffix(new, suffix)
+            child_items = _iter_items(v)
+            if child_items is not None:
+                stack.append((child_items, item_path))
+
+
+def _iter_items(value: Any) -> Optional[Iterator[tuple]]:
+    """Return an iterator over the (key, value) pairs of a mapping or sequence."""
+    if type(value) in _ATOMIC_TYPES:
+        return None
+    if isinstance(value, Mapping):
+        return iter(value.items())
+    elif isinstance(value, Sequence) and not isinstance(value, str):
+        return enumerate(value)
+    return None
 
 
 def replace_from_pattern(
@@ -58,39 +97,50 @@ def replace_from_pattern(
 
     """
     for leaf in find_suffix(fragment, postfix_trigger):
-        path = leaf.path
-        value = leaf.value
+        yield from _replace_leaf(
+            leaf, postfix_trigger, transform_value, expected_exceptions
+        )
 
-        if not path or value == REMOVED:
-            continue
 
-        key = path[-1]
+def _replace_leaf(
+    leaf: Fragment,
+    postfix_trigger: str,
+    transform_value: Callable[[Any, FragmentPath], Any],
+    expected_exceptions: Tuple[Type[Exception], ...] = (),
+) -> Iterator[Fragment]:
+    """Replace a single value found by :func:`replace_from_pattern`."""
+    path = leaf.path
+    value = leaf.value
 
-        yield leaf.clone(value=REMOVED, path=path)
+    if not path or value is REMOVED:
+        return
 
-        try:
-            # This allows "transform_value" to be a generator function as well.
-            new_value = transform_value(value, path)
-            if isinstance(new_value, Iterator):
-                items: list = list(new_value)
-            else:
-                items = [new_value]
-        except expected_exceptions:
-            continue
+    key = path[-1]
+
+    yield leaf.clone(value=REMOVED, path=path)
 
-        new_key = key[: -len(postfix_trigger)]
-        new_path = list(path[:-1])
-        if new_key:
-            new_path += [new_key]
+    try:
+        # This allows "transform_value" to be a generator function as well.
+        new_value = transform_value(value, path)
+        if isinstance(new_value, Iterator):
+            items: Sequence = list(new_value)
+        else:
+            items = (new_value,)
+    except expected_exceptions:
+        return
 
-        for item in items:
-            if isinstance(item, Fragment):
-                kwargs = {}
-                if item.source:
-                    kwargs["source"] = leaf.source + f":{item.source}"
-                yield leaf.clone(value=item.value, path=new_path, **kwargs)
-            else:
-                yield leaf.clone(value=item, path=new_path)
+    new_key = key[: -len(postfix_trigger)]
+    parent_path = path[:-1]
+    new_path = parent_path + (new_key,) if new_key else parent_path
+
+    for item in items:
+        if isinstance(item, Fragment):
+            kwargs = {}
+            if item.source:
+                kwargs["source"] = leaf.source + f":{item.source}"
+            yield leaf.clone(value=item.value, path=new_path, **kwargs)
+        else:
+            yield leaf.clone(value=item, path=new_path)
 
 
 def replace_from_env_vars(
@@ -167,7 +217,7 @@ def replace_from_file_vars(
             raise ValueError("file path must be string")
 
         try:
-            if glob.has_magic(value):
+            if _has_glob_magic(value):
                 yield from iter_load(value)
                 return
             try:
@@ -200,27 +250,73 @@ def replace_from_content_vars(fragment: Fragment) -> Iterator[Fragment]:
 
     """
 
-    file_loader_map = {
-        ext.strip("."): loader
-        for loader in FileLoader.registered_loaders
-        for ext in loader.valid_file_extensions
-    }
+    transforms_by_trigger = _content_transforms_by_trigger()
+    postfix_triggers = tuple(transforms_by_trigger)
 
-    for format_name, loader in file_loader_map.items():
-        postfix_trigger = f"_from_{format_name}_content"
+    # Find the values of all formats in one pass over the fragment and
+    # dispatch on the matching trigger. Values are replaced format by format
+    # (in the order of the loaders) as if each format was searched for
+    # separately.
+    matches: List[Tuple[int, str, Fragment]] = []
+    for leaf in find_suffix(fragment, postfix_triggers):
+        key = leaf.path[-1]
+        for i_trigger, postfix_trigger in enumerate(postfix_triggers):
+            if key.endswith(postfix_trigger):
+                matches.append((i_trigger, postfix_trigger, leaf))
+                break
+    matches.sort(key=lambda match: match[0])
 
-        def transform_value(value, path: FragmentPath):
-            try:
-                return loader.from_content(value)
-            except Exception:
-                path_str = ".".join(str(p) for p in path)
-                logger.info(
-                    "Error while trying to load %s content at %s.",
-                    format_name,
-                    path_str,
-                )
-                raise
+    for _, postfix_trigger, leaf in matches:
+        transform_value = transforms_by_trigger[postfix_trigger]
+        yield from _replace_leaf(leaf, postfix_trigger, transform_value, (Exception,))
 
-        yield from replace_from_pattern(
-            fragment, postfix_trigger, transform_value, (Exception,)
-        )
+
+_content_transforms_cache: Optional[
+    Tuple[tuple, Dict[str, Callable[[Any, FragmentPath], Any]]]
+] = None
+
+
+def _content_transforms_by_trigger() -> Dict[str, Callable[[Any, FragmentPath], Any]]:
+    """Return the content value transformations by their postfix trigger.
+
+    The mapping only changes when new file loaders are registered so it is
+    built once for each set of registered loaders.
+
+    """
+    global _content_transforms_cache
+    registered_loaders = tuple(FileLoader.registered_loaders)
+    if (
+        _content_transforms_cache is None
+        or _content_transforms_cache[0] != registered_loaders
+    ):
+        file_loader_map = {
+            ext.strip("."): loader
+            for loader in registered_loaders
+            for ext in loader.valid_file_extensions
+        }
+        transforms_by_trigger = {
+            f"_from_{format_name}_content": _make_content_transform(format_name, loader)
+            for format_name, loader in file_loader_map.items()
+        }
+        _content_transforms_cache = (registered_loaders, transforms_by_trigger)
+    return _content_transforms_cache[1]
+
+
+def _make_content_transform(
+    format_name: str, loader: FileLoader
+) -> Callable[[Any, FragmentPath], Any]:
+    """Create a value transformation that loads content with ``loader``."""
+
+    def transform_value(value, path: FragmentPath):
+        try:
+            return loader.from_content(value)
+        except Exception:
+            path_str = ".".join(str(p) for p in path)
+            logger.info(
+                "Error while trying to load %s content at %s.",
+                format_name,
+                path_str,
+            )
+            raise
+
+    return transform_value
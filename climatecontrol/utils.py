@@ -9,6 +9,10 @@ from typing import Any, Mapping, Sequence, Union
 
 from climatecontrol.constants import EMPTY
 
+# Exact types of values that are never walked into or copied. ``bytes`` is not
+# included as it is a sequence and is walked like one.
+_ATOMIC_TYPES = frozenset({str, int, float, bool, type(None)})
+
 
 def get_nested(obj: Union[Mapping, Sequence], path: Sequence) -> Any:
     """Get element of a sequence or map based on multiple nested keys.
@@ -63,11 +67,138 @@ def merge_nested(d: Any, u: Any) -> Any:
     return deepcopy(u)
 
 
+def copy_nested(obj: Any) -> Any:
+    """Copy nested dictionaries and lists but share all other values.
+
+    Example:
+        >>> leaf = {1, 2}
+        >>> d = {'a': [{'b': leaf}]}
+        >>> copied = copy_nested(d)
+        >>> copied == d, copied['a'][0] is d['a'][0], copied['a'][0]['b'] is leaf
+        (True, False, True)
+
+    """
+    obj_type = type(obj)
+    if obj_type is dict:
+        return {k: copy_nested(v) for k, v in obj.items()}
+    elif obj_type is list:
+        return [copy_nested(v) for v in obj]
+    return obj
+
+
+def merge_nested_inplace(d: Any, u: Any) -> Any:
+    """Merge ``u`` into ``d`` like :func:`merge_nested` but reuse the dicts and lists of ``d``.
+
+    Plain dictionaries and lists in ``d`` are updated in place instead of
+    being copied which makes merging many small updates into one object
+    linear in the size of the updates. Returns the merged object.
+
+    Example:
+        >>> d = {'a': {'b': [3, {'c': 4}, 5]}}
+        >>> merged = merge_nested_inplace(d, {'a': {'b': [EMPTY, {'d': 6}]}})
+        >>> merged
+        {'a': {'b': [3, {'c': 4, 'd': 6}, 5]}}
+        >>> merged is d
+        True
+
+    """
+    if not _is_inplace_mergeable(d, u):
+        return merge_nested(d, u)
+    # Walk pairs of containers with an explicit stack so that nested updates
+    # don't need a function call for every level.
+    stack = [(d, u)]
+    while stack:
+        d_container, u_container = stack.pop()
+        if type(d_container) is dict:
+            for k, u_v in u_container.items():
+                _merge_item_inplace(d_container, k, d_container.get(k), u_v, stack)
+        else:
+            n_items = len(d_container)
+            for i, u_item in enumerate(u_container):
+                if i >= n_items:
+                    d_container.append(deepcopy(u_item))
+                elif u_item is not EMPTY:
+                    _merge_item_inplace(d_container, i, d_container[i], u_item, stack)
+    return d
+
+
+def _merge_item_inplace(
+    d_container: Union[dict, list], key: Any, d_v: Any, u_v: Any, stack: list
+) -> None:
+    """Merge ``u_v`` into ``d_container[key]`` or defer it using ``stack``."""
+    if type(u_v) in _ATOMIC_TYPES:
+        # atomic values always replace the previous value
+        d_container[key] = u_v
+    elif _is_inplace_mergeable(d_v, u_v):
+        stack.append((d_v, u_v))
+    else:
+        d_container[key] = merge_nested(d_v, u_v)
+
+
+def _is_inplace_mergeable(d: Any, u: Any) -> bool:
+    """Check if ``u`` can be merged into ``d`` without replacing ``d``."""
+    d_type = type(d)
+    if d_type is dict:
+        return isinstance(u, collections.abc.Mapping)
+    elif d_type is list:
+        return isinstance(u, collections.abc.Sequence) and not isinstance(u, str)
+    return False
+
+
+def contains_nested(d: Any, u: Any) -> bool:
+    """Check if merging ``u`` into ``d`` using :func:`merge_nested` would leave ``d`` unchanged.
+
+    Example:
+        >>> contains_nested({'a': {'b': [1, 2]}, 'c': 3}, {'a': {'b': [EMPTY, 2]}})
+        True
+        >>> contains_nested({'a': {'b': [1, 2]}}, {'a': {'b': [1, 3]}})
+        False
+
+    """
+    if isinstance(u, Mapping):
+        return isinstance(d, Mapping) and all(
+            k in d and contains_nested(d[k], u_v) for k, u_v in u.items()
+        )
+    elif isinstance(u, collections.abc.Sequence) and not isinstance(u, str):
+        return (
+            isinstance(d, collections.abc.Sequence)
+            and not isinstance(d, str)
+            and len(u) <= len(d)
+            and all(
+                u_item is EMPTY or contains_nested(d_item, u_item)
+                for d_item, u_item in zip(d, u)
+            )
+        )
+    # compare types as well so that i.e. ``True`` does not match ``1``
+    return type(d) is type(u) and d == u
+
+
+# Characters a json document can start with (including the ``NaN`` and
+# ``Infinity`` constants accepted by :func:`json.loads`).
+_JSON_START_CHARS = frozenset('-0123456789"{[tfnNI')
+_json_loads = json.loads
+
+
 def parse_as_json_if_possible(v: str) -> Any:
-    """Parse a string value as json if possible, but fallback to the string if not."""
+    """Parse a string value as json if possible, but fallback to the string if not.
+
+    Example:
+        >>> parse_as_json_if_possible('[1, 2]')
+        [1, 2]
+        >>> parse_as_json_if_possible(' true')
+        True
+        >>> parse_as_json_if_possible('/usr/bin')
+        '/usr/bin'
+
+    """
     if isinstance(v, str):
+        # Most values are plain strings: skip the decoder (and the exception
+        # it raises) when the value can't be json.
+        first_char = v[:1]
+        if first_char not in _JSON_START_CHARS and not first_char.isspace():
+            return v
         try:
-            return json.loads(v)
+            return _json_loads(v)
         except json.JSONDecodeError:
             pass
     return v
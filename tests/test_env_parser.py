@@ -148,3 +148,63 @@ def test_env_parser_iter_load(monkeypatch, environ, expected_kw):
             return {str(f) for f in fragments}
 
         assert to_set(result) == to_set(expected)
+
+
+def test_env_parser_reads_env_changes(mock_empty_os_environ):
+    """Check that changes to the environment are seen by the next load."""
+    os.environ["TEST_STUFF_A"] = "1"
+    env_parser = EnvParser(prefix="TEST_STUFF")
+    assert [f.value for f in env_parser.iter_load()] == [1]
+    os.environ["TEST_STUFF_A"] = "2"
+    os.environ["TEST_STUFF_B"] = "3"
+    assert [f.value for f in env_parser.iter_load()] == [2, 3]
+
+
+def test_env_parser_reads_single_env_state(mock_empty_os_environ):
+    """Check that one load doesn't see changes made while it is running."""
+    os.environ["TEST_STUFF_A"] = "1"
+    os.environ["TEST_STUFF_B"] = "2"
+    env_parser = EnvParser(prefix="TEST_STUFF")
+    fragments = env_parser.iter_load()
+    assert next(fragments).value == 1
+    os.environ["TEST_STUFF_B"] = "3"
+    os.environ["TEST_STUFF_C"] = "4"
+    assert [f.value for f in fragments] == [2]
+
+
+def test_env_parser_multiple_settings_files(mock_empty_os_environ, tmpdir):
+    """Check that multiple settings files are loaded in the given order."""
+    paths = []
+    for i in range(5):
+        path = tmpdir.join("settings{}.json".format(i))
+        path.write('{"a": %d}' % i)
+        paths.append(str(path))
+    os.environ["TEST_STUFF_SETTINGS_FILE"] = ", ".join(paths)
+    env_parser = EnvParser(prefix="TEST_STUFF")
+    fragments = list(env_parser.iter_load())
+    assert [f.value for f in fragments] == [{"a": i} for i in range(5)]
+    assert [f.source for f in fragments] == [
+        "ENV:TEST_STUFF_SETTINGS_FILE:" + path for path in paths
+    ]
+
+
+@pytest.mark.parametrize(
+    "env_var, expected_path",
+    [
+        ("TEST_STUFF_A", ["a"]),
+        ("test_stuff_a__b", ["a", "b"]),
+        ("Test_Stuff_A", ["a"]),
+        ("xEST_STUFF_A", None),
+        ("TEST_STUF", None),
+    ],
+)
+def test_env_parser_prefix_case_insensitive(
+    mock_empty_os_environ, env_var, expected_path
+):
+    """Check that the prefix is matched regardless of case."""
+    os.environ[env_var] = "1"
+    fragments = list(EnvParser(prefix="TEST_STUFF").iter_load())
+    if expected_path is None:
+        assert fragments == []
+    else:
+        assert [list(f.path) for f in fragments] == [expected_path]
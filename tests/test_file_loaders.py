@@ -1 +1,112 @@
 """Test file loaders."""
+
+import json
+import math
+import os
+import subprocess
+import sys
+
+import pytest
+
+from climatecontrol import file_loaders
+from climatecontrol.file_loaders import JsonLoader, YamlLoader, iter_load
+from climatecontrol.fragment import Fragment
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "json"])
+def json_backend(request, monkeypatch):
+    """Run a test with and without ``orjson`` installed."""
+    if request.param:
+        pytest.importorskip("orjson")
+        assert file_loaders.orjson is not None
+    else:
+        monkeypatch.setattr(file_loaders, "orjson", None)
+    return request.param
+
+
+def test_json_loader_content(json_backend):
+    """Test that json content is loaded the same way as with the json module."""
+    data = JsonLoader.from_content(
+        '{"a": [1, 2.5, "x"], "big": 123456789012345678901234567890, "nan": NaN}'
+    )
+    assert data["a"] == [1, 2.5, "x"]
+    assert data["big"] == 123456789012345678901234567890
+    assert math.isnan(data["nan"])
+    with pytest.raises(ValueError):
+        JsonLoader.from_content("{")
+
+
+def test_iter_load_glob(tmpdir):
+    """Test that files matching a glob are loaded in sorted order."""
+    for i in reversed(range(6)):
+        tmpdir.join("settings{}.json".format(i)).write(json.dumps({"a": i}))
+    fragments = list(iter_load(str(tmpdir.join("settings*.json"))))
+    assert fragments == [
+        Fragment(value={"a": i}, source=str(tmpdir.join("settings{}.json".format(i))))
+        for i in range(6)
+    ]
+
+
+def test_iter_load_expands_path(tmpdir, monkeypatch):
+    """Test that environment variables and the home directory are expanded in paths."""
+    tmpdir.join("settings.json").write(json.dumps({"a": 1}))
+    monkeypatch.setenv("SETTINGS_DIR", str(tmpdir))
+    monkeypatch.setenv("HOME", str(tmpdir))
+    for path in ["$SETTINGS_DIR/settings.json", "~/settings.json"]:
+        fragments = list(iter_load(path))
+        assert fragments == [
+            Fragment(value={"a": 1}, source=str(tmpdir.join("settings.json")))
+        ]
+
+
+@pytest.mark.parametrize("mmap_min_size", [0, 1 << 30])
+def test_json_loader_path(tmpdir, monkeypatch, mocker, json_backend, mmap_min_size):
+    """Test that json files are loaded with or without memory mapping them."""
+    monkeypatch.setattr(file_loaders, "_MMAP_MIN_SIZE", mmap_min_size)
+    mmap_spy = mocker.spy(file_loaders.mmap, "mmap")
+    p = tmpdir.join("settings.json")
+    p.write('{"a": [1, 2], "b": "c"}')
+    assert JsonLoader.from_path(str(p)) == {"a": [1, 2], "b": "c"}
+    p.write('{"nan": NaN}')
+    assert math.isnan(JsonLoader.from_path(str(p))["nan"])
+    # files are only memory mapped if they are large enough and orjson is used
+    assert mmap_spy.call_count == (2 if json_backend and not mmap_min_size else 0)
+
+
+@pytest.mark.parametrize("mmap_min_size", [0, 1 << 30])
+def test_json_loader_empty_path(tmpdir, monkeypatch, json_backend, mmap_min_size):
+    """Test that empty json files fail like with the json module."""
+    monkeypatch.setattr(file_loaders, "_MMAP_MIN_SIZE", mmap_min_size)
+    p = tmpdir.join("settings.json")
+    p.write("")
+    with pytest.raises(json.JSONDecodeError):
+        JsonLoader.from_path(str(p))
+
+
+def test_yaml_loader_cache(tmpdir):
+    """Test that unchanged files are loaded from the cache as independent copies."""
+    p = tmpdir.join("settings.yaml")
+    p.write("a:\n  b: [1, 2]\n")
+    data = YamlLoader.from_path(str(p))
+    assert data == {"a": {"b": [1, 2]}}
+    data["a"]["b"].append(3)
+    assert YamlLoader.from_path(str(p)) == {"a": {"b": [1, 2]}}
+
+    p.write("a:\n  b: [1, 2, 3, 4]\n")
+    assert YamlLoader.from_path(str(p)) == {"a": {"b": [1, 2, 3, 4]}}
+
+    file_loaders.clear_file_cache()
+    assert not file_loaders._file_cache
+    assert YamlLoader.from_path(str(p)) == {"a": {"b": [1, 2, 3, 4]}}
+
+
+def test_parsers_imported_lazily():
+    """Test that the yaml and toml parsers are only imported when they are used."""
+    code = (
+        "import sys, climatecontrol.file_loaders as fl;"
+        "assert 'yaml' not in sys.modules and 'tomllib' not in sys.modules;"
+        "assert fl.YamlLoader.from_content('a: 1') == {'a': 1};"
+        "assert 'yaml' in sys.modules"
+    )
+    package_root = os.path.dirname(os.path.dirname(file_loaders.__file__))
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=package_root)
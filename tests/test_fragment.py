@@ -1,10 +1,12 @@
 """Tests for fragments."""
 
 import sys
+from copy import deepcopy
 
 import pytest
 
 from climatecontrol.fragment import EMPTY, Fragment, FragmentPath, merge_nested
+from climatecontrol.utils import merge_nested_inplace
 
 
 def test_fragment_path():
@@ -26,6 +28,9 @@ def test_fragment_path():
         str(FragmentPath(["a", "stuff", 1])) == "FragmentPath(['a', 'stuff', 1])"
     ), "Unexpected string representation"
     assert FragmentPath(["a", "stuff", 1])[1] == "stuff", "unexpected indexing"
+    assert hash(FragmentPath(["a", 1])) == hash(
+        FragmentPath(FragmentPath(["a", 1]))
+    ), "equal paths should have the same hash"
 
 
 @pytest.mark.parametrize(
@@ -160,6 +165,7 @@ def test_expand_value_with_path():
 def test_merge_nested(a, b, expected):
     """Testing nested merge."""
     assert merge_nested(a, b) == expected
+    assert merge_nested_inplace(deepcopy(a), b) == expected
 
 
 @pytest.mark.parametrize(
@@ -177,6 +183,16 @@ def test_merge_nested(a, b, expected):
             {"value": {"a": 4, "b": 2}, "path": ["root"]},
         ),
         ({"value": 3}, {"value": 5}, {"value": 5}),
+        (
+            {"value": 5, "path": ["root", "b", 1]},
+            {"value": {"a": 4, "b": ["c", "d"]}, "path": ["root"]},
+            {"value": {"a": 4, "b": ["c", "d"]}, "path": ["root"]},
+        ),
+        (
+            {"value": {"x": 1}, "path": ["root", "a"]},
+            {"value": 2, "path": ["root", "b"]},
+            {"value": {"a": {"x": 1}, "b": 2}, "path": ["root"]},
+        ),
     ],
 )
 def test_fragment_merge(a_kw, b_kw, expected_kw):
@@ -1,8 +1,10 @@
 """Test settings."""
+
 import json
 import os
 import sys
 from collections.abc import Mapping
+from copy import deepcopy
 from pathlib import Path
 from unittest.mock import MagicMock
 
@@ -10,7 +12,7 @@ import click
 import pytest
 from click.testing import CliRunner
 
-from climatecontrol import cli_utils, core  # noqa: E402
+from climatecontrol import cli_utils, core, file_loaders  # noqa: E402
 from climatecontrol.exceptions import NoCompatibleLoaderFoundError
 from climatecontrol.fragment import Fragment
 
@@ -79,6 +81,21 @@ def test_parse_from_file_vars(original, file_exists, mock_os_environ, tmpdir):
     assert actual == expected
 
 
+def test_parse_from_many_file_vars(mock_os_environ, tmpdir):
+    """Check that many "from_file" variables are all replaced by their file contents."""
+    climate = core.Climate()
+    update_dict = {}
+    expected = {}
+    for i in range(10):
+        filepath = tmpdir.join("testvarfile{}".format(i))
+        if i % 3:
+            filepath.write("value{}\n".format(i))
+            expected["var{}".format(i)] = "value{}".format(i)
+        update_dict["var{}_from_file".format(i)] = str(filepath)
+    climate.update({"group": update_dict})
+    assert climate.settings.group == expected
+
+
 def test_parse_from_file_root_var(mock_os_environ, tmpdir):
     """Check that the "from_file" extension works as expected when loading from root.
 
@@ -192,6 +209,21 @@ def test_settings_files_fail(mock_empty_os_environ, settings_files):
         climate.update()
 
 
+def test_clear_file_cache(mock_empty_os_environ, tmpdir):
+    """Check that reloading reuses cached files until the cache is cleared."""
+    path = tmpdir / "settings.yaml"
+    path.write("a: 1\n")
+    climate = core.Climate(settings_files=[str(path)])
+    assert climate.settings.a == 1
+    assert file_loaders._file_cache
+    climate.reload()
+    assert file_loaders._file_cache
+    climate.clear_file_cache()
+    assert not file_loaders._file_cache
+    climate.reload()
+    assert climate.settings.a == 1
+
+
 @pytest.mark.parametrize(
     "file_str, filename, mock_module",
     [
@@ -539,6 +571,33 @@ def test_inferred_settings_files(tmpdir, mock_empty_os_environ):
     }
 
 
+def test_inferred_settings_files_unlistable_dir(
+    tmpdir, monkeypatch, mock_empty_os_environ
+):
+    """Check that directories that can't be listed are still searched for markers."""
+    tmp_path = Path(tmpdir)
+    project_dir = tmp_path / "myproject"
+    project_dir.mkdir()
+    (project_dir / ".git").mkdir()
+    subproject_dir = project_dir / "subproject"
+    subproject_dir.mkdir()
+
+    scandir = os.scandir
+
+    def mock_scandir(path):
+        if Path(path).resolve() == project_dir.resolve():
+            raise PermissionError(13, "Permission denied", str(path))
+        return scandir(path)
+
+    monkeypatch.setattr(core.os, "scandir", mock_scandir)
+    search_directories = core._find_project_directories(subproject_dir)
+
+    assert [p.resolve() for p in search_directories] == [
+        subproject_dir.resolve(),
+        project_dir.resolve(),
+    ]
+
+
 def mock_parser_fcn(s):
     """Return input instead of doing some complex parsing."""
 
@@ -570,6 +629,40 @@ def test_update_clear_reload(mock_empty_os_environ, update, envvar, clear, reloa
     assert dict(climate.settings) == expected
 
 
+@pytest.mark.parametrize("value", [0, "", None, {}, []])
+def test_update_falsy_value_with_path(mock_empty_os_environ, value):
+    """Test that falsy values are still set when updating with a path."""
+    climate = core.Climate()
+    climate.update({"a": {"b": 1}})
+    climate.update(value, "a.b")
+    assert climate.settings.a.b == value
+
+
+def test_update_unchanged_values(mock_empty_os_environ, tmpdir):
+    """Test that updates that don't change any values are still applied after reloading."""
+    p = tmpdir.join("settings.json")
+    p.write('{"a": 1, "b": {"c": [1, 2]}}')
+    calls = []
+
+    def parser(data):
+        calls.append(data)
+        return data
+
+    climate = core.Climate(settings_files=[str(p)], parser=parser)
+    assert dict(climate.settings) == {"a": 1, "b": {"c": [1, 2]}}
+    assert len(calls) == 1
+
+    climate.update({"a": 1, "b": {"c": [1]}})
+    assert len(calls) == 1, "Settings should not have been parsed again"
+    climate.update({"a": True})
+    assert len(calls) == 2
+    assert climate.settings.a is True
+
+    p.write('{"a": 2, "b": {"c": [3, 4]}}')
+    climate.reload()
+    assert dict(climate.settings) == {"a": True, "b": {"c": [1, 4]}}
+
+
 def test_bad_config_recovery(mock_empty_os_environ):
     """Check that parsers that cause errors can recover correctly."""
 
@@ -613,6 +706,33 @@ def test_temporary_changes():
     assert len(climate.settings_files) == 0
 
 
+def test_temporary_changes_clear(mock_empty_os_environ):
+    """Test that clearing settings within a temporary changes context is rolled back."""
+    climate = core.Climate()
+    climate.update({"a": {"b": 1}})
+    with climate.temporary_changes():
+        climate.clear()
+        climate.update({"a": {"c": 2}})
+        assert dict(climate.settings) == {"a": {"c": 2}}
+    assert dict(climate.settings) == {"a": {"b": 1}}
+    assert climate._updates == [{"a": {"b": 1}}]
+    climate.update({"a": {"c": 3}})
+    assert dict(climate.settings) == {"a": {"b": 1, "c": 3}}
+
+
+def test_temporary_changes_in_place(mock_empty_os_environ):
+    """Test that settings changed in place within a temporary changes context are rolled back."""
+    climate = core.Climate()
+    climate.update({"a": [1], "b": {"x": 1}})
+    with climate.temporary_changes():
+        climate.settings.a.append(2)
+        climate.settings.b.update({"y": 2})
+        assert dict(climate.settings) == {"a": [1, 2], "b": {"x": 1, "y": 2}}
+    assert dict(climate.settings) == {"a": [1], "b": {"x": 1}}
+    climate.update({"c": 3})
+    assert dict(climate.settings) == {"a": [1], "b": {"x": 1}, "c": 3}
+
+
 @pytest.mark.parametrize("use_method", [True, False])
 @pytest.mark.parametrize("option_name", ["config", "settings"])
 @pytest.mark.parametrize("mode", ["config", "noconfig", "wrongfile"])
@@ -711,6 +831,31 @@ def test_settings_items(mock_empty_os_environ):
     assert climate.settings.d == []
 
 
+def test_clean_removed_items_in_sequences():
+    """Test that every removed item in a sequence is dropped, including nested ones."""
+    data = {"a": [core.REMOVED, core.REMOVED, 1], "b": [[core.REMOVED, {"c": 2}]]}
+    core.clean_removed_items(data)
+    assert data == {"a": [1], "b": [[{"c": 2}]]}
+
+
+def test_update_removes_consecutive_sequence_items(mock_empty_os_environ):
+    """Test that consecutive removed items in an update are all dropped."""
+    climate = core.Climate()
+    climate.update({"a": [core.REMOVED, core.REMOVED, 1]})
+    assert climate.settings.a == [1]
+
+
+def test_settings_items_reinitialize_after_clear(mock_empty_os_environ):
+    """Test that existing settings items trigger a reload after the settings are cleared."""
+    os.environ["CLIMATECONTROL_A__B"] = "1"
+    climate = core.Climate()
+    settings = climate.settings
+    assert settings.a == {"b": 1}
+    os.environ["CLIMATECONTROL_A__B"] = "2"
+    climate.clear()
+    assert settings.a == {"b": 2}
+
+
 @pytest.mark.parametrize("update", [False, "manual", "env"])
 def test_setup_logging(monkeypatch, update, mock_empty_os_environ):
     """Check that the setup_logging method intializes the logger and respects updates."""
@@ -751,3 +896,37 @@ def test_update_log(caplog, mock_empty_os_environ, mock_settings_file):
         "loaded b from external",
     ]
     assert set(lines) == set(expected_lines), "Unexpected lines in update_log"
+
+
+def test_combine_fragments_like_merge(mock_empty_os_environ):
+    """Check that combining many fragments gives the same result as merging them one by one."""
+    fragments = [
+        Fragment({"a": {"b": [1, 2, 3]}}, source="first", path=["root"]),
+        Fragment(4, source="second", path=["root", "a", "b", 4]),
+        Fragment({"c": 5}, source="", path=["root", "a", "b", 1]),
+        Fragment({"d": 6}, source="fourth", path=["root"]),
+    ]
+    original = deepcopy(fragments)
+    expected = fragments[0]
+    for fragment in fragments[1:]:
+        expected = expected.merge(fragment)
+
+    combined = core.Climate()._combine_fragments(fragments)
+    assert combined == expected
+    assert combined.source == "first, second, fourth"
+    assert fragments == original, "fragments should not be modified"
+
+
+def test_from_content_multiple_formats(mock_empty_os_environ):
+    """Check that content of different formats is replaced in the same update."""
+    climate = core.Climate()
+    climate.update(
+        {
+            "a_from_json_content": '{"b": 1}',
+            "c": {"d_from_toml_content": "e = 2", "f_from_yml_content": "g: 3"},
+        }
+    )
+    assert dict(climate.settings) == {
+        "a": {"b": 1},
+        "c": {"d": {"e": 2}, "f": {"g": 3}},
+    }